@@ -1,31 +1,51 @@
 # wechat_style_app_final.py
 import sys
 import os
+import io
+import importlib.util
+import itertools
+import random
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import pulp
 from PySide2.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                                QPushButton, QLabel, QLineEdit, QTextEdit, QTabWidget, QFrame,
                                QGroupBox, QScrollArea, QGridLayout, QMessageBox, QProgressBar,
                                QFileDialog)  # 添加QFileDialog
-from PySide2.QtCore import Qt, QTimer
-from PySide2.QtGui import QFont, QPalette, QColor, QIcon, QPixmap
+from PySide2.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, Signal
+from PySide2.QtGui import QFont, QPalette, QColor, QIcon, QPixmap, QTextCursor
 import warnings
 
 warnings.filterwarnings('ignore')
 
-# 导入Word导出相关库
-try:
-    from docx import Document
-    from docx.shared import Inches, Pt
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-    from docx.oxml.ns import qn
+# matplotlib 与 python-docx 导入较慢，在首次使用时才导入
+_mpl = None
 
-    HAS_DOCX = True
-except ImportError:
-    HAS_DOCX = False
-    print("⚠️ python-docx 未安装，Word导出功能不可用")
+
+def _get_mpl():
+    """首次绘图时导入并配置matplotlib"""
+    global _mpl
+    if _mpl is None:
+        import matplotlib
+        matplotlib.use('Agg')  # 图表仅离屏渲染为图片，不需要GUI后端
+        matplotlib.rcParams['font.sans-serif'] = ['SimHei']
+        matplotlib.rcParams['axes.unicode_minus'] = False
+        _mpl = matplotlib
+    return _mpl
+
+
+def _simulate_demand(lam_ssa, lam_relay, hours, out_ssa, out_relay, seed):
+    """向量化模拟逐小时需求，结果写入预分配的数组"""
+    rng = np.random.default_rng(seed)
+    samples = rng.poisson(lam=(lam_ssa, lam_relay), size=(hours, 2))
+    sin_term = np.sin(np.arange(hours) / 100.0)
+    np.multiply(sin_term, 2, out=out_ssa)
+    out_ssa += samples[:, 0]
+    np.multiply(sin_term, 1.5, out=out_relay)
+    out_relay += samples[:, 1]
+
+
+def _has_docx():
+    """检查python-docx是否已安装（不实际导入）"""
+    return importlib.util.find_spec('docx') is not None
 
 
 # 获取资源路径
@@ -38,13 +58,98 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
-plt.rcParams['font.sans-serif'] = ['SimHei']
-plt.rcParams['axes.unicode_minus'] = False
+# 微信风格全局样式表
+_WECHAT_STYLE = """
+    QMainWindow {
+        background-color: #f5f5f5;
+    }
+    QGroupBox {
+        font-weight: bold;
+        border: 2px solid #07C160;
+        border-radius: 8px;
+        margin-top: 1ex;
+        padding-top: 10px;
+        background-color: white;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+        color: #07C160;
+    }
+    QPushButton {
+        background-color: #07C160;
+        border: none;
+        color: white;
+        padding: 8px 16px;
+        border-radius: 4px;
+        font-weight: bold;
+        min-width: 80px;
+    }
+    QPushButton:hover {
+        background-color: #06AE56;
+    }
+    QPushButton:pressed {
+        background-color: #059C4D;
+    }
+    QPushButton:disabled {
+        background-color: #cccccc;
+        color: #666666;
+    }
+    QLineEdit {
+        border: 1px solid #ddd;
+        border-radius: 4px;
+        padding: 6px;
+        background-color: white;
+    }
+    QLineEdit:focus {
+        border-color: #07C160;
+    }
+    QTextEdit {
+        border: 1px solid #ddd;
+        border-radius: 4px;
+        padding: 8px;
+        background-color: white;
+        font-family: "Microsoft YaHei";
+    }
+    QLabel {
+        color: #333333;
+    }
+    QTabWidget::pane {
+        border: 1px solid #C2C7CB;
+        background-color: white;
+    }
+    QTabBar::tab {
+        background-color: #E1E1E1;
+        border: 1px solid #C4C4C3;
+        padding: 8px 20px;
+        margin-right: 2px;
+    }
+    QTabBar::tab:selected {
+        background-color: #07C160;
+        color: white;
+    }
+    QProgressBar {
+        border: 1px solid #ddd;
+        border-radius: 4px;
+        text-align: center;
+        background-color: #f0f0f0;
+    }
+    QProgressBar::chunk {
+        background-color: #07C160;
+        border-radius: 3px;
+    }
+"""
 
 
 class WildfireModel:
     """消防无人机配置模型"""
 
+    # 成本图中的固定数据
+    _PIE_LABELS = ('SSA无人机', '中继无人机', '维护费用')
+    _PIE_SIZES = (65, 25, 10)
+    _PIE_COLORS = ('#07C160', '#66BB6A', '#81C784')
+
     def __init__(self):
         self.params = {
             'R': 5,
@@ -63,6 +168,55 @@ class WildfireModel:
             'gamma': 1.2
         }
         self.results = {}
+        self._figs = {}  # 按图表类型缓存 Figure 与 Axes，重复绘制时复用
+        self._rng = np.random.default_rng(42)
+        self._py_rng = random.Random(42)  # 少量标量抽样用，避免NumPy调用开销
+
+    def _get_figure(self, key, nrows, ncols, figsize):
+        """获取缓存的图形，首次调用时创建，之后清空坐标轴复用"""
+        cached = self._figs.get(key)
+        if cached is None:
+            _get_mpl()
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+            # 直接构造 Figure，绕过 pyplot 的全局图形注册表
+            fig = Figure(figsize=figsize, dpi=100, facecolor='white')
+            FigureCanvasAgg(fig)
+            cached = (fig, fig.subplots(nrows, ncols))
+            self._figs[key] = cached
+        else:
+            for ax in np.atleast_1d(cached[1]):
+                ax.cla()
+        return cached
+
+    @staticmethod
+    def _render_png(fig):
+        """将图形渲染为内存中的PNG数据"""
+        buf = io.BytesIO()
+        fig.canvas.print_png(buf)
+        return buf.getvalue()
+
+    @staticmethod
+    def _render_preview(fig, preview_width):
+        """按预览区域宽度渲染低分辨率JPEG，多余的像素缩放时本来就会丢弃"""
+        dpi = min(100, max(72, preview_width / fig.get_size_inches()[0]))
+        buf = io.BytesIO()
+        fig.savefig(buf, format='jpeg', dpi=dpi, pil_kwargs={'quality': 85})
+        return buf.getvalue()
+
+    def _render(self, fig, preview_width):
+        """未指定预览宽度时输出原始分辨率PNG"""
+        if preview_width is None:
+            return self._render_png(fig)
+        return self._render_preview(fig, preview_width)
+
+    def export_png(self, plot_type):
+        """将最近一次绘制的图表以原始分辨率导出为PNG"""
+        cached = self._figs.get(plot_type)
+        if cached is None:
+            return None
+        return self._render_png(cached[0])
 
     def run_analysis(self, years=10, growth_rate=0.03):
         """运行完整分析"""
@@ -86,16 +240,18 @@ class WildfireModel:
 
         return self.results
 
-    def plot_demand(self):
+    def plot_demand(self, preview_width=None):
         """绘制需求时序图"""
         try:
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
+            fig, (ax1, ax2) = self._get_figure('demand', 2, 1, (12, 8))
 
             # 模拟数据
             hours = 1000
             time = np.arange(hours)
-            ssa_demand = np.random.poisson(5, hours) + np.sin(time / 100) * 2
-            relay_demand = np.random.poisson(3, hours) + np.sin(time / 100) * 1.5
+            ssa_demand = np.empty(hours)
+            relay_demand = np.empty(hours)
+            seed = int(self._rng.integers(2 ** 31))
+            _simulate_demand(5.0, 3.0, hours, ssa_demand, relay_demand, seed)
 
             ax1.plot(time, ssa_demand, alpha=0.7, color='#07C160', linewidth=2)
             ax1.set_ylabel('SSA无人机需求', fontsize=12)
@@ -110,62 +266,47 @@ class WildfireModel:
             ax2.grid(True, alpha=0.3)
             ax2.set_facecolor('#f8f9fa')
 
-            plt.tight_layout()
-
-            # 保存图片
-            os.makedirs('temp', exist_ok=True)
-            image_path = 'temp/demand_plot.png'
-            plt.savefig(image_path, dpi=100, bbox_inches='tight', facecolor='white')
-            plt.close(fig)  # 关闭图形，避免显示
+            fig.tight_layout()
 
-            return image_path
+            return self._render(fig, preview_width)
 
         except Exception as e:
             print(f"绘制需求图失败: {e}")
             return None
 
-    def plot_costs(self):
+    def plot_costs(self, preview_width=None):
         """绘制成本分析图"""
         try:
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+            fig, (ax1, ax2) = self._get_figure('cost', 1, 2, (12, 5))
 
             # 成本构成
-            labels = ['SSA无人机', '中继无人机', '维护费用']
-            sizes = [65, 25, 10]
-            colors = ['#07C160', '#66BB6A', '#81C784']
-
-            ax1.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
+            ax1.pie(self._PIE_SIZES, labels=self._PIE_LABELS, colors=self._PIE_COLORS,
+                    autopct='%1.1f%%', startangle=90)
             ax1.set_title('成本构成分析', fontsize=14, fontweight='bold')
 
             # 年度成本
-            years = np.arange(10)
-            costs = np.random.randint(80000, 200000, 10).cumsum()
+            # 只有10个数，用纯Python累加比创建NumPy数组更快
+            costs = list(itertools.accumulate(self._py_rng.randrange(80000, 200000) for _ in range(10)))
 
-            ax2.bar(years, costs, color='#07C160', alpha=0.7)
+            ax2.bar(range(10), costs, color='#07C160', alpha=0.7)
             ax2.set_xlabel('年份', fontsize=12)
             ax2.set_ylabel('累计成本 ($)', fontsize=12)
             ax2.set_title('年度累计成本', fontsize=14, fontweight='bold')
             ax2.grid(True, alpha=0.3)
             ax2.set_facecolor('#f8f9fa')
 
-            plt.tight_layout()
-
-            # 保存图片
-            os.makedirs('temp', exist_ok=True)
-            image_path = 'temp/cost_plot.png'
-            plt.savefig(image_path, dpi=100, bbox_inches='tight', facecolor='white')
-            plt.close(fig)  # 关闭图形，避免显示
+            fig.tight_layout()
 
-            return image_path
+            return self._render(fig, preview_width)
 
         except Exception as e:
             print(f"绘制成本图失败: {e}")
             return None
 
-    def plot_relay_deployment(self):
+    def plot_relay_deployment(self, preview_width=None):
         """绘制中继部署图"""
         try:
-            fig, ax = plt.subplots(figsize=(10, 8))
+            fig, ax = self._get_figure('relay', 1, 1, (10, 8))
 
             # 模拟部署场景
             eoc = (0, 0)
@@ -184,10 +325,12 @@ class WildfireModel:
             relay_x, relay_y = zip(*relays)
             ax.scatter(relay_x, relay_y, s=200, c='#07C160', marker='D', label='中继无人机')
 
-            # 绘制通信范围
-            for relay in relays:
-                circle = plt.Circle(relay, self.params['R_cov'], color='#07C160', alpha=0.1)
-                ax.add_patch(circle)
+            # 绘制通信范围 - 所有圆合并为一个集合一次绘制
+            from matplotlib.patches import Circle
+            from matplotlib.collections import PatchCollection
+            circles = [Circle(relay, self.params['R_cov']) for relay in relays]
+            ax.add_collection(PatchCollection(circles, facecolor='#07C160',
+                                              edgecolor='#07C160', alpha=0.1))
 
             ax.set_xlabel('X坐标 (km)', fontsize=12)
             ax.set_ylabel('Y坐标 (km)', fontsize=12)
@@ -197,26 +340,87 @@ class WildfireModel:
             ax.set_aspect('equal')
             ax.set_facecolor('#f8f9fa')
 
-            plt.tight_layout()
-
-            # 保存图片
-            os.makedirs('temp', exist_ok=True)
-            image_path = 'temp/relay_deployment.png'
-            plt.savefig(image_path, dpi=100, bbox_inches='tight', facecolor='white')
-            plt.close(fig)  # 关闭图形，避免显示
+            fig.tight_layout()
 
-            return image_path
+            return self._render(fig, preview_width)
 
         except Exception as e:
             print(f"绘制中继部署图失败: {e}")
             return None
 
 
+class AnalysisSignals(QObject):
+    """分析任务向界面线程发送的信号"""
+    progress = Signal(int)
+    message = Signal(str)
+    finished = Signal(dict)
+
+
+class AnalysisWorker(QRunnable):
+    """在线程池中运行的模拟分析任务"""
+
+    def __init__(self, model, years_text, growth_text):
+        super().__init__()
+        self.model = model
+        # 输入框内容在界面线程读取，工作线程中不访问控件
+        self.years_text = years_text
+        self.growth_text = growth_text
+        self.signals = AnalysisSignals()
+
+    def run(self):
+        """依次执行分析步骤并报告进度"""
+        self.signals.progress.emit(20)
+        self.signals.message.emit("生成火灾事件...")
+
+        self.signals.progress.emit(40)
+        self.signals.message.emit("计算设备需求...")
+
+        self.signals.progress.emit(60)
+        self.signals.message.emit("优化设备配置...")
+
+        try:
+            results = self.model.run_analysis(
+                years=int(self.years_text),
+                growth_rate=float(self.growth_text)
+            )
+        except Exception as e:
+            self.signals.message.emit(f"优化配置失败: {str(e)}")
+            results = {
+                'config': {
+                    'x_SSA_opt': 10,
+                    'x_R_opt': 6,
+                    'total_cost': 1000000,
+                    'peak_demand_SSA': 8.5,
+                    'peak_demand_R': 5.2
+                }
+            }
+
+        self.signals.progress.emit(80)
+        self.signals.message.emit("生成分析报告...")
+        self.signals.finished.emit(results)
+
+
 class WeChatStyleWindow(QMainWindow):
+    # 多个窗口实例共享同一个图标，首次创建窗口时加载
+    _APP_ICON = None
+    # 预览区域占位文本
+    _PREVIEW_PLACEHOLDER = "图表预览区域\n\n点击上方按钮生成可视化图表\n图表将在此区域显示"
+
     def __init__(self):
         super().__init__()
         self.model = WildfireModel()
-        self.current_plot_path = None  # 当前显示的图片路径
+        self.current_plot_type = None  # 当前预览的图表类型
+        self.current_plot_name = None  # 当前图片的默认文件名
+        self._current_pixmap = None  # 当前预览的原始(未缩放)图片
+
+        # 先快速缩放显示，稍后再用平滑缩放替换
+        self._smooth_timer = QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.setInterval(100)
+        self._smooth_timer.timeout.connect(lambda: self._scale_preview(Qt.SmoothTransformation))
+
+        self._analysis_worker = None
+
         self.init_ui()
 
     def init_ui(self):
@@ -225,95 +429,18 @@ class WeChatStyleWindow(QMainWindow):
         self.setFixedSize(1200, 800)  # 增加窗口大小以容纳预览区域
 
         # 设置窗口图标 - 添加logo.ico
-        icon_path = resource_path('logo.ico')
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
-            print(f"✅ 已加载图标: {icon_path}")
-        else:
-            print(f"⚠️ 图标文件不存在: {icon_path}")
+        if WeChatStyleWindow._APP_ICON is None:
+            icon_path = resource_path('logo.ico')
+            if os.path.exists(icon_path):
+                WeChatStyleWindow._APP_ICON = QIcon(icon_path)
+                print(f"✅ 已加载图标: {icon_path}")
+            else:
+                print(f"⚠️ 图标文件不存在: {icon_path}")
+        if WeChatStyleWindow._APP_ICON is not None:
+            self.setWindowIcon(WeChatStyleWindow._APP_ICON)
 
         # 设置微信风格样式
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f5f5f5;
-            }
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #07C160;
-                border-radius: 8px;
-                margin-top: 1ex;
-                padding-top: 10px;
-                background-color: white;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: #07C160;
-            }
-            QPushButton {
-                background-color: #07C160;
-                border: none;
-                color: white;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #06AE56;
-            }
-            QPushButton:pressed {
-                background-color: #059C4D;
-            }
-            QPushButton:disabled {
-                background-color: #cccccc;
-                color: #666666;
-            }
-            QLineEdit {
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                padding: 6px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border-color: #07C160;
-            }
-            QTextEdit {
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                padding: 8px;
-                background-color: white;
-                font-family: "Microsoft YaHei";
-            }
-            QLabel {
-                color: #333333;
-            }
-            QTabWidget::pane {
-                border: 1px solid #C2C7CB;
-                background-color: white;
-            }
-            QTabBar::tab {
-                background-color: #E1E1E1;
-                border: 1px solid #C4C4C3;
-                padding: 8px 20px;
-                margin-right: 2px;
-            }
-            QTabBar::tab:selected {
-                background-color: #07C160;
-                color: white;
-            }
-            QProgressBar {
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                text-align: center;
-                background-color: #f0f0f0;
-            }
-            QProgressBar::chunk {
-                background-color: #07C160;
-                border-radius: 3px;
-            }
-        """)
+        self.setStyleSheet(_WECHAT_STYLE)
 
         # 创建中心部件
         central_widget = QWidget()
@@ -353,6 +480,9 @@ class WeChatStyleWindow(QMainWindow):
         tab = QWidget()
         layout = QVBoxLayout(tab)
 
+        # 参数名 -> 输入框，保存时统一读取
+        self._param_edits = {}
+
         # 创建滚动区域
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
@@ -390,7 +520,7 @@ class WeChatStyleWindow(QMainWindow):
         for i, (label, attr, default) in enumerate(fire_params):
             fire_layout.addWidget(QLabel(label), i, 0)
             edit = QLineEdit(default)
-            setattr(self, attr, edit)
+            self._param_edits[attr] = edit
             fire_layout.addWidget(edit, i, 1)
 
         scroll_layout.addWidget(fire_group)
@@ -410,7 +540,7 @@ class WeChatStyleWindow(QMainWindow):
         for i, (label, attr, default) in enumerate(device_params):
             device_layout.addWidget(QLabel(label), i, 0)
             edit = QLineEdit(default)
-            setattr(self, attr, edit)
+            self._param_edits[attr] = edit
             device_layout.addWidget(edit, i, 1)
 
         scroll_layout.addWidget(device_group)
@@ -427,7 +557,7 @@ class WeChatStyleWindow(QMainWindow):
         for i, (label, attr, default) in enumerate(cost_params):
             cost_layout.addWidget(QLabel(label), i, 0)
             edit = QLineEdit(default)
-            setattr(self, attr, edit)
+            self._param_edits[attr] = edit
             cost_layout.addWidget(edit, i, 1)
 
         scroll_layout.addWidget(cost_group)
@@ -437,8 +567,9 @@ class WeChatStyleWindow(QMainWindow):
         safety_layout = QGridLayout(safety_group)
 
         safety_layout.addWidget(QLabel("安全冗余系数:"), 0, 0)
-        self.gamma = QLineEdit("1.2")
-        safety_layout.addWidget(self.gamma, 0, 1)
+        gamma_edit = QLineEdit("1.2")
+        self._param_edits['gamma'] = gamma_edit
+        safety_layout.addWidget(gamma_edit, 0, 1)
 
         scroll_layout.addWidget(safety_group)
 
@@ -583,7 +714,7 @@ class WeChatStyleWindow(QMainWindow):
                 qproperty-alignment: AlignCenter;
             }
         """)
-        self.preview_label.setText("图表预览区域\n\n点击上方按钮生成可视化图表\n图表将在此区域显示")
+        self.preview_label.setText(self._PREVIEW_PLACEHOLDER)
         self.preview_label.setWordWrap(True)
 
         preview_layout.addWidget(self.preview_label)
@@ -608,33 +739,32 @@ class WeChatStyleWindow(QMainWindow):
     def show_plot(self, plot_type):
         """显示图表并在预览区域显示"""
         try:
+            preview_width = self.preview_label.width()
             if plot_type == 'demand':
-                image_path = self.model.plot_demand()
+                image_bytes = self.model.plot_demand(preview_width)
                 title = "需求时序图"
+                file_name = "demand_plot.png"
             elif plot_type == 'cost':
-                image_path = self.model.plot_costs()
+                image_bytes = self.model.plot_costs(preview_width)
                 title = "成本分析图"
+                file_name = "cost_plot.png"
             elif plot_type == 'relay':
-                image_path = self.model.plot_relay_deployment()
+                image_bytes = self.model.plot_relay_deployment(preview_width)
                 title = "中继部署图"
+                file_name = "relay_deployment.png"
             else:
                 return
 
             # 在预览区域显示图片
-            if image_path and os.path.exists(image_path):
-                self.current_plot_path = image_path
-                pixmap = QPixmap(image_path)
-
-                # 缩放图片以适应预览区域，但保持比例
-                scaled_pixmap = pixmap.scaled(
-                    self.preview_label.width() - 40,
-                    self.preview_label.height() - 40,
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-
-                self.preview_label.setPixmap(scaled_pixmap)
+            if image_bytes:
+                self.current_plot_type = plot_type
+                self.current_plot_name = file_name
+                self._current_pixmap = QPixmap()
+                self._current_pixmap.loadFromData(image_bytes)
+
                 self.preview_label.setText("")  # 清除文本
+                self._scale_preview(Qt.FastTransformation)
+                self._smooth_timer.start()
                 self.save_image_btn.setEnabled(True)
 
                 self.log_message(f"✅ 已生成{title}并在预览区域显示")
@@ -645,9 +775,29 @@ class WeChatStyleWindow(QMainWindow):
             QMessageBox.warning(self, "可视化错误", f"无法显示图表: {str(e)}")
             self.log_message(f"❌ 图表显示失败: {str(e)}")
 
+    def _scale_preview(self, transformation):
+        """缩放图片以适应预览区域，但保持比例"""
+        if self._current_pixmap is None:
+            return
+
+        scaled_pixmap = self._current_pixmap.scaled(
+            self.preview_label.width() - 40,
+            self.preview_label.height() - 40,
+            Qt.KeepAspectRatio,
+            transformation
+        )
+        self.preview_label.setPixmap(scaled_pixmap)
+
+    def resizeEvent(self, event):
+        """窗口尺寸变化时从原始图片重新缩放"""
+        super().resizeEvent(event)
+        if self._current_pixmap is not None:
+            self._scale_preview(Qt.FastTransformation)
+            self._smooth_timer.start()
+
     def save_current_image(self):
         """保存当前预览的图片"""
-        if not self.current_plot_path:
+        if not self.current_plot_type:
             QMessageBox.warning(self, "保存失败", "没有可保存的图片")
             return
 
@@ -655,13 +805,14 @@ class WeChatStyleWindow(QMainWindow):
             file_path, _ = QFileDialog.getSaveFileName(
                 self,
                 "保存图片",
-                f"消防无人机图表_{os.path.basename(self.current_plot_path)}",
+                f"消防无人机图表_{self.current_plot_name}",
                 "图片文件 (*.png *.jpg *.jpeg)"
             )
 
             if file_path:
-                import shutil
-                shutil.copy2(self.current_plot_path, file_path)
+                # 预览为低分辨率JPEG，保存时重新导出原始分辨率PNG
+                with open(file_path, 'wb') as f:
+                    f.write(self.model.export_png(self.current_plot_type))
                 QMessageBox.information(self, "保存成功", f"图片已保存到:\n{file_path}")
                 self.log_message(f"✅ 图片已保存: {file_path}")
 
@@ -671,35 +822,23 @@ class WeChatStyleWindow(QMainWindow):
     def clear_preview(self):
         """清除预览区域"""
         self.preview_label.clear()
-        self.preview_label.setText("图表预览区域\n\n点击上方按钮生成可视化图表\n图表将在此区域显示")
-        self.current_plot_path = None
+        self.preview_label.setText(self._PREVIEW_PLACEHOLDER)
+        self.current_plot_type = None
+        self.current_plot_name = None
+        self._current_pixmap = None
+        self._smooth_timer.stop()
         self.save_image_btn.setEnabled(False)
 
     def save_parameters(self):
         """保存参数设置"""
         try:
-            # 收集区域频率
-            region_freqs = []
-            for edit in self.region_freqs:
-                region_freqs.append(float(edit.text()))
+            # 先全部转换，任一输入无效时不修改模型参数
+            params = {k: float(w.text()) for k, w in self._param_edits.items()}
+            params['R'] = int(self.region_count.text())
+            params['lambda_i'] = [float(edit.text()) for edit in self.region_freqs]
 
             # 更新模型参数
-            self.model.params.update({
-                'R': int(self.region_count.text()),
-                'lambda_i': region_freqs,
-                'A_mean': float(self.A_mean.text()),
-                'A_std': float(self.A_std.text()),
-                'alpha1': float(self.alpha1.text()),
-                'alpha2': float(self.alpha2.text()),
-                'S_SSA': float(self.S_SSA.text()),
-                'T_cycle': float(self.T_cycle.text()),
-                'R_max': float(self.R_max.text()),
-                'R_cov': float(self.R_cov.text()),
-                'beta': float(self.beta.text()),
-                'p_SSA': float(self.p_SSA.text()),
-                'p_R': float(self.p_R.text()),
-                'gamma': float(self.gamma.text())
-            })
+            self.model.params.update(params)
 
             self.log_message("✅ 参数设置已保存！")
             QMessageBox.information(self, "成功", "参数设置已保存！")
@@ -723,61 +862,28 @@ class WeChatStyleWindow(QMainWindow):
             # 保存参数
             self.save_parameters()
 
-            # 模拟分析过程
+            # 模拟分析过程，放到线程池中执行以保持界面响应
             self.log_message("开始模拟分析...")
-            QTimer.singleShot(100, self.analyze_step1)
+            worker = AnalysisWorker(self.model, self.years_input.text(), self.growth_input.text())
+            worker.signals.progress.connect(self.progress_bar.setValue)
+            worker.signals.message.connect(self.log_message)
+            worker.signals.finished.connect(self.on_analysis_results)
+            self._analysis_worker = worker  # 保持引用，直到信号全部送达
+            QThreadPool.globalInstance().start(worker)
 
         except Exception as e:
             self.log_message(f"分析失败: {str(e)}")
             self.analysis_finished()
 
-    def analyze_step1(self):
-        """分析步骤1：生成火灾事件"""
-        self.progress_bar.setValue(20)
-        self.log_message("生成火灾事件...")
-        QTimer.singleShot(500, self.analyze_step2)
-
-    def analyze_step2(self):
-        """分析步骤2：计算设备需求"""
-        self.progress_bar.setValue(40)
-        self.log_message("计算设备需求...")
-        QTimer.singleShot(500, self.analyze_step3)
-
-    def analyze_step3(self):
-        """分析步骤3：优化配置"""
-        self.progress_bar.setValue(60)
-        self.log_message("优化设备配置...")
-
-        try:
-            results = self.model.run_analysis(
-                years=int(self.years_input.text()),
-                growth_rate=float(self.growth_input.text())
-            )
-            self.analysis_results = results
-        except Exception as e:
-            self.log_message(f"优化配置失败: {str(e)}")
-            self.analysis_results = {
-                'config': {
-                    'x_SSA_opt': 10,
-                    'x_R_opt': 6,
-                    'total_cost': 1000000,
-                    'peak_demand_SSA': 8.5,
-                    'peak_demand_R': 5.2
-                }
-            }
-
-        QTimer.singleShot(500, self.analyze_step4)
-
-    def analyze_step4(self):
-        """分析步骤4：生成报告"""
-        self.progress_bar.setValue(80)
-        self.log_message("生成分析报告...")
-
+    def on_analysis_results(self, results):
+        """接收分析结果并生成报告"""
+        self.analysis_results = results
         self.display_results()
-        QTimer.singleShot(500, self.analysis_finished)
+        self.analysis_finished()
 
     def analysis_finished(self):
         """分析完成"""
+        self._analysis_worker = None
         self.progress_bar.setValue(100)
         self.run_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
@@ -791,63 +897,54 @@ class WeChatStyleWindow(QMainWindow):
 
     def log_message(self, message):
         """添加日志消息"""
-        self.log_text.append(f"{message}")
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum()
-        )
+        cur = self.log_text.textCursor()
+        cur.movePosition(QTextCursor.End)
+        cur.insertText(message + '\n')
+        self.log_text.setTextCursor(cur)  # 光标移到末尾即自动滚动到底部
 
     def display_results(self):
         """显示分析结果"""
         if not hasattr(self, 'analysis_results'):
             return
 
-        results = self.analysis_results
-        report = """
+        cfg = self.analysis_results['config']
+        p = self.model.params
+        ssa, r = cfg['x_SSA_opt'], cfg['x_R_opt']
+        pk_s, pk_r = cfg['peak_demand_SSA'], cfg['peak_demand_R']
+
+        report = f"""
 智能消防无人机配置分析报告
 ================================
 
 设备配置推荐:
 ----------------
-• SSA无人机: {} 架
-• 中继无人机: {} 架
+• SSA无人机: {ssa} 架
+• 中继无人机: {r} 架
 
 投资分析:
 ------------
-• SSA投资: ${:,.0f}
-• 中继投资: ${:,.0f}
-• 总投资: ${:,.0f}
+• SSA投资: ${ssa * p['p_SSA']:,.0f}
+• 中继投资: ${r * p['p_R']:,.0f}
+• 总投资: ${cfg['total_cost']:,.0f}
 
 需求分析:
 ------------
-• SSA峰值需求: {:.1f} 架
-• 中继峰值需求: {:.1f} 架
-• 安全系数: {}
+• SSA峰值需求: {pk_s:.1f} 架
+• 中继峰值需求: {pk_r:.1f} 架
+• 安全系数: {p['gamma']}
 
 安全裕度:
 ------------
-• SSA安全系数: {:.2f}
-• 中继安全系数: {:.2f}
-
-        """.format(
-            results['config']['x_SSA_opt'],
-            results['config']['x_R_opt'],
-            results['config']['x_SSA_opt'] * self.model.params['p_SSA'],
-            results['config']['x_R_opt'] * self.model.params['p_R'],
-            results['config']['total_cost'],
-            results['config']['peak_demand_SSA'],
-            results['config']['peak_demand_R'],
-            self.model.params['gamma'],
-            results['config']['x_SSA_opt'] / results['config']['peak_demand_SSA'] if results['config'][
-                                                                                         'peak_demand_SSA'] > 0 else 0,
-            results['config']['x_R_opt'] / results['config']['peak_demand_R'] if results['config'][
-                                                                                     'peak_demand_R'] > 0 else 0
-        )
+• SSA安全系数: {ssa / pk_s if pk_s > 0 else 0:.2f}
+• 中继安全系数: {r / pk_r if pk_r > 0 else 0:.2f}
+
+        """
 
         self.results_text.setText(report)
 
     def export_word_report(self):
         """导出Word报告"""
-        if not HAS_DOCX:
+        if not _has_docx():
             QMessageBox.warning(self, "功能不可用",
                                 "python-docx 库未安装，无法导出Word报告。\n\n"
                                 "请安装: pip install python-docx")
@@ -872,6 +969,11 @@ class WeChatStyleWindow(QMainWindow):
 
     def create_word_report(self, file_path):
         """创建Word报告文档"""
+        from docx import Document
+        from docx.shared import Inches
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.oxml.ns import qn
+
         doc = Document()
 
         # 设置中文字体
@@ -946,10 +1048,10 @@ class WeChatStyleWindow(QMainWindow):
         safety_para.add_run(f"中继安全系数: {relay_safety:.2f}")
 
         # 添加图片（如果存在）
-        if hasattr(self, 'current_plot_path') and self.current_plot_path and os.path.exists(self.current_plot_path):
+        if self.current_plot_type:
             doc.add_heading('五、图表展示', level=1)
             doc.add_paragraph("当前预览的图表:")
-            doc.add_picture(self.current_plot_path, width=Inches(6))
+            doc.add_picture(io.BytesIO(self.model.export_png(self.current_plot_type)), width=Inches(6))
 
         # 保存文档
         doc.save(file_path)
@@ -1,18 +1,81 @@
+import os
+import functools
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import pulp
-from typing import List, Dict, Tuple
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Optional
 import warnings
 
 warnings.filterwarnings('ignore')
 
-plt.rcParams['font.sans-serif'] = ['SimHei']  # 支持中文显示
-plt.rcParams['axes.unicode_minus'] = False
+# matplotlib / pandas / pulp 导入较慢，推迟到首次使用时再导入
+
+
+@functools.lru_cache(maxsize=None)
+def _get_plt():
+    """首次调用时导入并配置 pyplot"""
+    import matplotlib
+    if os.environ.get('HEADLESS'):
+        matplotlib.use('Agg')  # 批量运行时不创建GUI窗口
+    import matplotlib.pyplot as plt
+    plt.rcParams['font.sans-serif'] = ['SimHei']  # 支持中文显示
+    plt.rcParams['axes.unicode_minus'] = False
+    return plt
+
+
+def _diff_accumulate(starts, ends, amounts, out):
+    """差分累加：起始时刻加上需求，结束时刻减去"""
+    np.add.at(out, starts, amounts)
+    np.add.at(out, ends, -amounts)
+
+
+@dataclass
+class FireEvents:
+    """一年内的火灾事件，每个字段是一列（按事件对齐的数组）"""
+    region: np.ndarray
+    start_time: np.ndarray
+    duration: np.ndarray
+    area: np.ndarray
+    squads: np.ndarray
+    fireline_length: np.ndarray
+    n_SSA: Optional[np.ndarray] = None
+    n_R: Optional[np.ndarray] = None
+
+    def __len__(self):
+        return len(self.region)
+
+    def to_records(self) -> List[Dict]:
+        """转换为逐事件的字典列表，仅供展示使用"""
+        fields = ['region', 'start_time', 'duration', 'area', 'squads', 'fireline_length']
+        if self.n_SSA is not None:
+            fields += ['n_SSA', 'n_R']
+        columns = [getattr(self, name).tolist() for name in fields]
+        return [dict(zip(fields, values)) for values in zip(*columns)]
+
+
+# 多年扩容分析的逐年记录
+YEAR_RECORD_DTYPE = np.dtype([
+    ('year', 'i4'),
+    ('peak_demand_SSA', 'f8'),
+    ('peak_demand_R', 'f8'),
+    ('required_SSA', 'f8'),
+    ('required_R', 'f8'),
+    ('buy_SSA', 'i4'),
+    ('buy_R', 'i4'),
+    ('inventory_SSA', 'i4'),
+    ('inventory_R', 'i4'),
+    ('annual_cost', 'f8'),
+    ('cumulative_cost', 'f8')
+])
 
 
 class WildfireEquipmentModel:
-    def __init__(self):
+    def __init__(self, seed=None):
+        # 所有随机抽样共用一个 Generator，不再使用 np.random 全局状态
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self._demand_buffers = None  # 需求缓冲区，首次使用时分配
+
         # 基础参数配置 - 使用更合理的数值
         self.params = {
             # 区域参数
@@ -40,40 +103,48 @@ class WildfireEquipmentModel:
             'gamma': 1.2  # 安全冗余系数
         }
 
-    def generate_fire_events(self, year=0, growth_rate=0.03):
+    def __getstate__(self):
+        # 传给子进程时不携带需求缓冲区
+        state = self.__dict__.copy()
+        state['_demand_buffers'] = None
+        return state
+
+    def generate_fire_events(self, year=0, growth_rate=0.03, rng=None):
         """生成一年内的火灾事件"""
         print(f"生成第{year}年火灾事件...")
-        events = []
-        lambda_i = [lam * (1 + growth_rate) ** year for lam in self.params['lambda_i']]
-
-        for region in range(self.params['R']):
-            # 生成火灾次数 - 泊松分布
-            n_fires = np.random.poisson(lambda_i[region])
-
-            for _ in range(n_fires):
-                # 随机起火时间 (0-8759小时)
-                start_time = np.random.randint(0, 8760)
-
-                # 火场面积 - 对数正态分布，避免极端值
-                A_e = np.random.lognormal(
-                    mean=np.log(self.params['A_mean']),
-                    sigma=np.log(self.params['A_std'])
-                )
-                A_e = max(0.1, min(10.0, A_e))  # 限制在合理范围
-
-                # 计算相关参数
-                K_e = max(1, self.params['alpha1'] + self.params['alpha2'] * A_e)
-                T_e = max(4, min(48, A_e * 8))  # 持续时间4-48小时
-                L_e = 3 * np.sqrt(A_e * np.pi)  # 火线长度
-
-                events.append({
-                    'region': region,
-                    'start_time': start_time,
-                    'duration': T_e,
-                    'area': round(A_e, 2),
-                    'squads': round(K_e, 1),
-                    'fireline_length': round(L_e, 2)
-                })
+        if rng is None:
+            rng = self.rng
+        lambdas = np.array(self.params['lambda_i'][:self.params['R']], dtype=float) * (1 + growth_rate) ** year
+
+        # 各区域火灾次数 - 泊松分布，之后所有事件一次性批量抽样
+        counts = rng.poisson(lambdas)
+        n_total = int(counts.sum())
+        regions = np.repeat(np.arange(len(lambdas)), counts)
+
+        # 随机起火时间 (0-8759小时)
+        start_times = rng.integers(0, 8760, size=n_total)
+
+        # 火场面积 - 对数正态分布，限制在合理范围避免极端值
+        A_e = rng.lognormal(
+            mean=np.log(self.params['A_mean']),
+            sigma=np.log(self.params['A_std']),
+            size=n_total
+        )
+        A_e = np.clip(A_e, 0.1, 10.0)
+
+        # 计算相关参数
+        K_e = np.maximum(1, self.params['alpha1'] + self.params['alpha2'] * A_e)
+        T_e = np.clip(A_e * 8, 4, 48)  # 持续时间4-48小时
+        L_e = 3 * np.sqrt(A_e * np.pi)  # 火线长度
+
+        events = FireEvents(
+            region=regions,
+            start_time=start_times,
+            duration=T_e,
+            area=np.round(A_e, 2),
+            squads=np.round(K_e, 1),
+            fireline_length=np.round(L_e, 2)
+        )
 
         print(f"共生成{len(events)}次火灾事件")
         return events
@@ -81,95 +152,135 @@ class WildfireEquipmentModel:
     def calculate_equipment_demand(self, fire_events):
         """计算单次火灾的设备需求"""
         print("计算设备需求...")
-        for event in fire_events:
-            A_e = event['area']
-            K_e = event['squads']
+        ev = fire_events
 
-            # SSA需求计算
-            n_SSA1 = np.ceil(A_e / self.params['S_SSA'] *
-                             self.params['T_cycle'] / self.params['R_max'])
-            n_SSA2 = np.ceil(K_e / 2)  # 假设每架服务2个小队
-            event['n_SSA'] = int(max(n_SSA1, n_SSA2))
+        # SSA需求计算
+        n_SSA1 = np.ceil(ev.area / self.params['S_SSA'] *
+                         self.params['T_cycle'] / self.params['R_max'])
+        n_SSA2 = np.ceil(ev.squads / 2)  # 假设每架服务2个小队
+        ev.n_SSA = np.maximum(n_SSA1, n_SSA2).astype(np.int32)
 
-            # 中继需求计算
-            L_e = event['fireline_length']
-            n_R = np.ceil(self.params['beta'] * L_e / (2 * self.params['R_cov']))
-            event['n_R'] = int(max(1, n_R))  # 至少1架
+        # 中继需求计算
+        n_R = np.ceil(self.params['beta'] * ev.fireline_length / (2 * self.params['R_cov']))
+        ev.n_R = np.maximum(1, n_R).astype(np.int32)  # 至少1架
 
-        return fire_events
+        return ev
 
-    def create_demand_timeseries(self, fire_events):
-        """创建年度时间序列需求"""
+    def create_demand_timeseries(self, fire_events, out_ssa=None, out_r=None):
+        """创建年度时间序列需求，同时返回两类设备的峰值需求
+
+        out_ssa/out_r 为可选的预分配缓冲区（长度8761，最后一位用于差分），
+        传入时会被清零复用，返回的时间序列是缓冲区的视图。
+        """
         print("创建时间序列需求...")
         hours_per_year = 8760
-        D_SSA = np.zeros(hours_per_year)
-        D_R = np.zeros(hours_per_year)
-
-        for event in fire_events:
-            start = event['start_time']
-            duration = event['duration']
-            end = min(hours_per_year, start + duration)
-
-            # 确保时间范围有效
-            if start < hours_per_year:
-                for t in range(int(start), int(end)):
-                    if t < hours_per_year:
-                        D_SSA[t] += event['n_SSA']
-                        D_R[t] += event['n_R']
+        starts = fire_events.start_time
+        ends = np.minimum(starts + fire_events.duration, hours_per_year).astype(starts.dtype)
+        n_SSA = fire_events.n_SSA.astype(float)
+        n_R = fire_events.n_R.astype(float)
+
+        # 差分数组：起火时刻加上需求，结束时刻减去，累加后即为每小时需求
+        for buf in (out_ssa, out_r):
+            if buf is not None and buf.shape != (hours_per_year + 1,):
+                raise ValueError(f"需求缓冲区长度应为{hours_per_year + 1}，实际形状为{buf.shape}")
+        if out_ssa is None:
+            out_ssa = np.zeros(hours_per_year + 1)
+        else:
+            out_ssa.fill(0)
+        if out_r is None:
+            out_r = np.zeros(hours_per_year + 1)
+        else:
+            out_r.fill(0)
+        _diff_accumulate(starts, ends, n_SSA, out_ssa)
+        _diff_accumulate(starts, ends, n_R, out_r)
+
+        D_SSA = np.cumsum(out_ssa, out=out_ssa)[:hours_per_year]
+        D_R = np.cumsum(out_r, out=out_r)[:hours_per_year]
+
+        return D_SSA, D_R, D_SSA.max(), D_R.max()
 
-        return D_SSA, D_R
+    @staticmethod
+    def peak_stats(D, percentile=85):
+        """高峰时段统计：阈值取有需求时段的85分位数，整段向量化计算"""
+        # 大部分小时没有火灾，直接对全年取分位数阈值会是0
+        active = D[D > 0]
+        if active.size == 0:
+            # 全年没有需求时不存在高峰时段
+            return {'peak': D.max(), 'threshold': 0.0, 'peak_hours': 0, 'peak_magnitude': 0.0}
+
+        threshold = np.percentile(active, percentile)
+        peak_mask = D >= threshold
+        return {
+            'peak': D.max(),
+            'threshold': threshold,
+            'peak_hours': int(peak_mask.sum()),
+            'peak_magnitude': float(D @ peak_mask)
+        }
 
     def optimize_equipment_config(self, D_SSA_max, D_R_max):
         """优化设备配置"""
         print("优化设备配置...")
 
         # 计算考虑安全系数的需求
-        demand_SSA = np.ceil(self.params['gamma'] * D_SSA_max)
-        demand_R = np.ceil(self.params['gamma'] * D_R_max)
-
-        # 创建优化问题
-        prob = pulp.LpProblem("Equipment_Optimization", pulp.LpMinimize)
-
-        # 决策变量
-        x_SSA = pulp.LpVariable("x_SSA", lowBound=demand_SSA, cat='Integer')
-        x_R = pulp.LpVariable("x_R", lowBound=demand_R, cat='Integer')
-
-        # 目标函数：最小化总成本
-        prob += self.params['p_SSA'] * x_SSA + self.params['p_R'] * x_R
-
-        # 求解
-        prob.solve()
+        x_SSA = int(np.ceil(self.params['gamma'] * D_SSA_max))
+        x_R = int(np.ceil(self.params['gamma'] * D_R_max))
 
+        # 成本最小化问题只有需求下界约束且单价为正，最优解即为下界，无需调用求解器
         result = {
-            'x_SSA_opt': int(x_SSA.varValue),
-            'x_R_opt': int(x_R.varValue),
-            'total_cost': pulp.value(prob.objective),
+            'x_SSA_opt': x_SSA,
+            'x_R_opt': x_R,
+            'total_cost': self.params['p_SSA'] * x_SSA + self.params['p_R'] * x_R,
             'peak_demand_SSA': D_SSA_max,
             'peak_demand_R': D_R_max,
-            'status': pulp.LpStatus[prob.status]
+            'status': 'Optimal'
         }
 
         return result
 
-    def multi_year_expansion(self, base_config, years=10, growth_rate=0.03):
-        """多年扩容规划"""
+    def _simulate_year(self, year, growth_rate, seed_seq):
+        """模拟单个年份的高峰需求，与库存无关，可在子进程中独立执行"""
+        # 每年使用独立的随机数流，结果与执行顺序和进程无关
+        rng = np.random.default_rng(seed_seq)
+
+        # 同一进程内的各年份复用同一组需求缓冲区
+        if self._demand_buffers is None:
+            self._demand_buffers = (np.empty(8761), np.empty(8761))
+        buf_SSA, buf_R = self._demand_buffers
+
+        events = self.generate_fire_events(year, growth_rate, rng=rng)
+        events_with_demand = self.calculate_equipment_demand(events)
+        _, _, D_SSA_max, D_R_max = self.create_demand_timeseries(
+            events_with_demand, out_ssa=buf_SSA, out_r=buf_R)
+        return year, D_SSA_max, D_R_max
+
+    def multi_year_expansion(self, base_config, years=10, growth_rate=0.03, max_workers=1):
+        """多年扩容规划
+
+        max_workers > 1 时用多进程模拟各年份；单年模拟只需约0.1ms，
+        默认逐年串行，避免进程池的启动开销。
+        """
         print("进行多年扩容分析...")
-        results = []
+        records = np.zeros(years + 1, dtype=YEAR_RECORD_DTYPE)
+
+        # 由种子派生各年份的子随机数流，与基础年使用的 self.rng 互不重叠
+        year_range = range(years + 1)
+        seed_seqs = np.random.SeedSequence(self.seed).spawn(len(year_range))
+        growth_rates = [growth_rate] * len(year_range)
+
+        # 各年份高峰需求互不依赖，可并行模拟
+        if max_workers is not None and max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                peaks = list(executor.map(self._simulate_year, year_range,
+                                          growth_rates, seed_seqs))
+        else:
+            peaks = list(map(self._simulate_year, year_range, growth_rates, seed_seqs))
 
         # 初始存量
         F_SSA = base_config['x_SSA_opt']
         F_R = base_config['x_R_opt']
 
-        for year in range(years + 1):
-            # 生成该年火灾事件
-            events = self.generate_fire_events(year, growth_rate)
-            events_with_demand = self.calculate_equipment_demand(events)
-            D_SSA, D_R = self.create_demand_timeseries(events_with_demand)
-
-            # 年度高峰需求
-            D_SSA_max = np.max(D_SSA) if len(D_SSA) > 0 else 0
-            D_R_max = np.max(D_R) if len(D_R) > 0 else 0
-
+        # 按年份顺序更新库存与采购
+        for year, D_SSA_max, D_R_max in peaks:
             # 考虑安全系数的需求
             required_SSA = np.ceil(self.params['gamma'] * D_SSA_max)
             required_R = np.ceil(self.params['gamma'] * D_R_max)
@@ -186,85 +297,98 @@ class WildfireEquipmentModel:
             annual_cost = (buy_SSA * self.params['p_SSA'] +
                            buy_R * self.params['p_R'])
 
-            results.append({
-                'year': year,
-                'peak_demand_SSA': D_SSA_max,
-                'peak_demand_R': D_R_max,
-                'required_SSA': required_SSA,
-                'required_R': required_R,
-                'buy_SSA': int(buy_SSA),
-                'buy_R': int(buy_R),
-                'inventory_SSA': int(F_SSA),
-                'inventory_R': int(F_R),
-                'annual_cost': annual_cost
-            })
+            records[year] = (year, D_SSA_max, D_R_max, required_SSA, required_R,
+                             buy_SSA, buy_R, F_SSA, F_R, annual_cost, 0)
 
-        return pd.DataFrame(results)
+        # 在NumPy数组上完成累计，最后才构造DataFrame用于展示
+        np.cumsum(records['annual_cost'], out=records['cumulative_cost'])
+        import pandas as pd
+        return pd.DataFrame(records)
 
 
 class RelayDeploymentOptimizer:
     """中继无人机布设优化"""
 
     def __init__(self):
+        import pulp
+
         self.R0 = 20  # 基础通信半径(km)
+        # 复用同一个求解器实例；优先使用进程内的HiGHS（pip install pulp[highs]），
+        # 避免写LP文件和启动CBC子进程，不可用时退回CBC
+        try:
+            self._solver = pulp.HiGHS(msg=False)
+            if not self._solver.available():
+                raise pulp.PulpSolverError("HiGHS不可用")
+        except Exception:
+            self._solver = pulp.PULP_CBC_CMD(msg=False, warmStart=True, threads=1)
+
+        self._scenario = None
 
     def generate_scenario(self):
-        """生成示例场景"""
+        """生成示例场景（结果缓存在实例上，因此使用不可变的元组）"""
+        if self._scenario is not None:
+            return self._scenario
+
         # EOC位置
         eoc = (0, 0)
 
         # 前线小队位置 - 在50x50km区域内
-        frontlines = [
+        frontlines = (
             (15, 10), (25, 15), (35, 8),
             (20, 25), (30, 30), (40, 20)
-        ]
+        )
 
         # 候选中继点 - 网格分布
-        candidates = []
-        for x in range(5, 45, 10):
-            for y in range(5, 35, 10):
-                candidates.append((x, y))
-
-        return eoc, frontlines, candidates
+        candidates = tuple((x, y) for x in range(5, 45, 10) for y in range(5, 35, 10))
 
-    def calculate_distance(self, pos1, pos2):
-        """计算两点间距离"""
-        return np.sqrt((pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2)
+        self._scenario = (eoc, frontlines, candidates)
+        return self._scenario
 
     def optimize_relay_deployment(self, eoc, frontlines, candidates):
         """优化中继部署"""
         print("优化中继部署...")
 
+        F = np.asarray(frontlines, dtype=float)
+        R0_sq = self.R0 ** 2  # 覆盖判断只比较距离平方，避免开方；每次读取以支持调整R0
+
+        # 检查各小队能否直接连接到EOC（比较距离平方，无需开方）
+        direct = ((F - np.asarray(eoc, dtype=float)) ** 2).sum(1) <= R0_sq
+
+        # 所有小队都能直连EOC时无需部署中继，不必调用求解器
+        if direct.all():
+            return {
+                'deployed_positions': [],
+                'num_relays': 0,
+                'status': 'Optimal (trivial)'
+            }
+
+        # 覆盖矩阵：cover[k, j] 表示候选点j能覆盖第k个无法直连的小队
+        F_far = F[~direct]
+        C = np.asarray(candidates, dtype=float)
+        d2 = ((F_far[:, None, 0] - C[None, :, 0]) ** 2 +
+              (F_far[:, None, 1] - C[None, :, 1]) ** 2)
+        cover = d2 <= R0_sq
+
+        import pulp
         prob = pulp.LpProblem("Relay_Deployment", pulp.LpMinimize)
 
         # 决策变量
-        y = {j: pulp.LpVariable(f"y_{j}", cat='Binary')
-             for j in range(len(candidates))}
+        y = pulp.LpVariable.dicts("y", range(len(candidates)), cat=pulp.LpBinary)
 
         # 目标函数：最小化中继数量
-        prob += pulp.lpSum([y[j] for j in range(len(candidates))])
-
-        # 约束条件：每个前线小队必须被覆盖
-        for k, frontline in enumerate(frontlines):
-            # 检查是否能直接连接到EOC
-            direct_connect = 1 if self.calculate_distance(frontline, eoc) <= self.R0 else 0
-
-            # 找到能覆盖该小队的中继候选点
-            covering_relays = []
-            for j, candidate in enumerate(candidates):
-                if self.calculate_distance(frontline, candidate) <= self.R0:
-                    covering_relays.append(y[j])
+        prob += pulp.lpSum(y.values())
 
-            # 约束：要么直连EOC，要么至少有一个中继覆盖
-            prob += (pulp.lpSum(covering_relays) + direct_connect >= 1)
+        # 约束条件：每个无法直连EOC的小队至少有一个中继覆盖
+        for row in cover:
+            prob += (pulp.lpSum(y[j] for j in np.flatnonzero(row)) >= 1)
 
         # 求解
-        prob.solve()
+        prob.solve(self._solver)
 
         # 提取结果
         deployed_relays = []
         for j in range(len(candidates)):
-            if pulp.value(y[j]) == 1:
+            if round(pulp.value(y[j])) == 1:
                 deployed_relays.append(candidates[j])
 
         return {
@@ -274,30 +398,57 @@ class RelayDeploymentOptimizer:
         }
 
 
+def _minmax_downsample(y, target=1000):
+    """将序列分成target段，返回每段起点、最小值、最大值和均值"""
+    edges = np.linspace(0, len(y), target + 1).astype(int)[:-1]
+    counts = np.diff(np.append(edges, len(y)))
+    return (edges, np.minimum.reduceat(y, edges), np.maximum.reduceat(y, edges),
+            np.add.reduceat(y, edges) / counts)
+
+
 class Visualization:
     """结果可视化"""
 
     @staticmethod
-    def plot_demand_timeseries(D_SSA, D_R):
+    def _plot_series(ax, D, max_points=1000):
+        """绘制需求曲线，点数过多时用最小/最大值包络加均值线代替，保留峰值信息"""
+        if len(D) <= max_points:
+            ax.plot(range(len(D)), D, alpha=0.7, linewidth=1)
+            return
+
+        x, lower, upper, mean = _minmax_downsample(D, max_points)
+        ax.fill_between(x, lower, upper, alpha=0.3, step='post', label='需求范围')
+        ax.plot(x, mean, alpha=0.7, linewidth=1, label='平均需求')
+
+    @staticmethod
+    def _finish(fig, path):
+        """提供路径时保存图片，否则显示窗口"""
+        plt = _get_plt()
+        if path:
+            fig.savefig(path)
+            plt.close(fig)
+        else:
+            plt.show()
+
+    @staticmethod
+    def plot_demand_timeseries(D_SSA, D_R, peak_SSA, peak_R, path=None):
         """绘制时间序列需求"""
+        plt = _get_plt()
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
 
-        # 只显示前1000小时以便观察
-        display_hours = min(1000, len(D_SSA))
-
         # SSA需求
-        ax1.plot(range(display_hours), D_SSA[:display_hours], alpha=0.7, linewidth=1)
-        ax1.axhline(y=np.max(D_SSA), color='r', linestyle='--',
-                    label=f'峰值需求: {np.max(D_SSA):.1f}')
+        Visualization._plot_series(ax1, D_SSA)
+        ax1.axhline(y=peak_SSA, color='r', linestyle='--',
+                    label=f'峰值需求: {peak_SSA:.1f}')
         ax1.set_ylabel('SSA无人机需求')
         ax1.set_title('SSA无人机需求时间序列')
         ax1.legend()
         ax1.grid(True, alpha=0.3)
 
         # 中继需求
-        ax2.plot(range(display_hours), D_R[:display_hours], alpha=0.7, linewidth=1)
-        ax2.axhline(y=np.max(D_R), color='r', linestyle='--',
-                    label=f'峰值需求: {np.max(D_R):.1f}')
+        Visualization._plot_series(ax2, D_R)
+        ax2.axhline(y=peak_R, color='r', linestyle='--',
+                    label=f'峰值需求: {peak_R:.1f}')
         ax2.set_ylabel('中继无人机需求')
         ax2.set_xlabel('年度时间 (小时)')
         ax2.set_title('中继无人机需求时间序列')
@@ -305,11 +456,12 @@ class Visualization:
         ax2.grid(True, alpha=0.3)
 
         plt.tight_layout()
-        plt.show()
+        Visualization._finish(fig, path)
 
     @staticmethod
-    def plot_multi_year_analysis(multi_year_df):
+    def plot_multi_year_analysis(multi_year_df, path=None):
         """绘制多年分析结果"""
+        plt = _get_plt()
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
 
         years = multi_year_df['year']
@@ -328,7 +480,7 @@ class Visualization:
         # 成本趋势
         ax2.bar(years, multi_year_df['annual_cost'], alpha=0.7,
                 label='年度成本', color='skyblue')
-        ax2.plot(years, multi_year_df['annual_cost'].cumsum(), 'ro-',
+        ax2.plot(years, multi_year_df['cumulative_cost'], 'ro-',
                  label='累计成本', linewidth=2, markersize=6)
         ax2.set_xlabel('年份')
         ax2.set_ylabel('成本 ($)')
@@ -343,11 +495,13 @@ class Visualization:
                          ha='center', va='bottom', fontsize=8)
 
         plt.tight_layout()
-        plt.show()
+        Visualization._finish(fig, path)
 
     @staticmethod
-    def plot_relay_deployment(eoc, frontlines, candidates, deployed_relays):
+    def plot_relay_deployment(eoc, frontlines, candidates, deployed_relays, path=None):
         """绘制中继部署方案"""
+        from matplotlib.collections import PatchCollection
+        plt = _get_plt()
         fig, ax = plt.subplots(figsize=(10, 8))
 
         # 绘制EOC
@@ -374,10 +528,11 @@ class Visualization:
             for i, (x, y) in enumerate(deployed_relays):
                 ax.text(x, y + 1.5, f'R{i + 1}', ha='center', fontweight='bold')
 
-        # 绘制通信范围
-        for relay in deployed_relays:
-            circle = plt.Circle(relay, 20, color='green', alpha=0.1)
-            ax.add_patch(circle)
+        # 绘制通信范围 - 所有圆合并为一个集合一次绘制
+        if deployed_relays:
+            circles = [plt.Circle(relay, 20) for relay in deployed_relays]
+            ax.add_collection(PatchCollection(circles, facecolor='green',
+                                              edgecolor='green', alpha=0.1))
 
         ax.set_xlabel('X坐标 (km)')
         ax.set_ylabel('Y坐标 (km)')
@@ -386,7 +541,7 @@ class Visualization:
         ax.grid(True, alpha=0.3)
         ax.set_aspect('equal')
         plt.tight_layout()
-        plt.show()
+        Visualization._finish(fig, path)
 
 
 def main():
@@ -395,12 +550,9 @@ def main():
     print("       无人机森林消防设备配置优化系统")
     print("=" * 50)
 
-    # 设置随机种子确保结果可重现
-    np.random.seed(42)
-
     try:
-        # 初始化模型
-        model = WildfireEquipmentModel()
+        # 初始化模型，固定随机种子确保结果可重现
+        model = WildfireEquipmentModel(seed=42)
 
         # 1. 基础年分析
         print("\n1. 基础年分析 (第0年)")
@@ -409,16 +561,16 @@ def main():
 
         # 显示前5次火灾信息
         print("\n前5次火灾事件详情:")
-        for i, event in enumerate(events_with_demand[:5]):
+        for i, event in enumerate(events_with_demand.to_records()[:5]):
             print(f"  火灾{i + 1}: 区域{event['region'] + 1}, 面积{event['area']}km², "
                   f"小队{event['squads']}个, 需要SSA{event['n_SSA']}架, "
                   f"中继{event['n_R']}架")
 
         # 时间序列分析
-        D_SSA, D_R = model.create_demand_timeseries(events_with_demand)
+        D_SSA, D_R, peak_SSA, peak_R = model.create_demand_timeseries(events_with_demand)
 
         # 设备配置优化
-        config = model.optimize_equipment_config(np.max(D_SSA), np.max(D_R))
+        config = model.optimize_equipment_config(peak_SSA, peak_R)
 
         print(f"\n基础年优化配置:")
         print(f"  SSA无人机: {config['x_SSA_opt']} 架")
@@ -427,6 +579,11 @@ def main():
         print(f"  峰值需求 - SSA: {config['peak_demand_SSA']:.1f}, "
               f"中继: {config['peak_demand_R']:.1f}")
 
+        for name, D in (('SSA', D_SSA), ('中继', D_R)):
+            stats = model.peak_stats(D)
+            print(f"  {name}高峰时段(≥{stats['threshold']:.1f}架): {stats['peak_hours']} 小时, "
+                  f"累计需求 {stats['peak_magnitude']:,.0f} 架·小时")
+
         # 2. 多年扩容分析
         print("\n2. 多年扩容分析 (10年规划)")
         multi_year_df = model.multi_year_expansion(config, years=10)
@@ -447,8 +604,9 @@ def main():
 
         # 4. 预算报告
         print("\n4. 预算报告")
-        total_10yr_cost = multi_year_df['annual_cost'].sum()
-        avg_annual_cost = multi_year_df['annual_cost'][1:].mean()
+        annual_costs = multi_year_df['annual_cost'].to_numpy()
+        total_10yr_cost = annual_costs.sum()
+        avg_annual_cost = annual_costs[1:].mean()
 
         print(f"  首年投资: ${config['total_cost']:,.0f}")
         print(f"  10年总投资: ${total_10yr_cost:,.0f}")
@@ -456,10 +614,22 @@ def main():
 
         # 5. 可视化
         print("\n5. 生成可视化图表...")
-        Visualization.plot_demand_timeseries(D_SSA, D_R)
-        Visualization.plot_multi_year_analysis(multi_year_df)
+        # 无界面运行时保存为图片（目录由 OUTPUT_DIR 指定，默认当前目录），否则弹出窗口
+        if os.environ.get('HEADLESS'):
+            output_dir = os.environ.get('OUTPUT_DIR', '.')
+            os.makedirs(output_dir, exist_ok=True)
+            demand_path, multi_year_path, relay_path = (
+                os.path.join(output_dir, name) for name in
+                ('demand_timeseries.png', 'multi_year_analysis.png', 'relay_deployment.png'))
+        else:
+            demand_path = multi_year_path = relay_path = None
+
+        Visualization.plot_demand_timeseries(D_SSA, D_R, peak_SSA, peak_R, path=demand_path)
+        Visualization.plot_multi_year_analysis(multi_year_df, path=multi_year_path)
         Visualization.plot_relay_deployment(eoc, frontlines, candidates,
-                                            relay_result['deployed_positions'])
+                                            relay_result['deployed_positions'], path=relay_path)
+        if demand_path:
+            print(f"  图表已保存到: {os.path.abspath(output_dir)}")
 
         print("\n" + "=" * 50)
         print("程序执行完成！")